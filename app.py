@@ -1,6 +1,7 @@
 import streamlit as st
-import tempfile
-import os
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from sentence_transformers import SentenceTransformer
 from config import Config
 from document_processor import DocumentProcessor
 from vector_store import VectorStore
@@ -13,6 +14,12 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_embedder():
+    """Load the embedding model once per process, on the GPU when one is available"""
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    return SentenceTransformer('all-MiniLM-L6-v2', device=device)
+
 @st.cache_resource
 def initialize_components():
     """Initialize all components"""
@@ -20,10 +27,34 @@ def initialize_components():
     
     # Initialize components
     doc_processor = DocumentProcessor(config.CHUNK_SIZE, config.CHUNK_OVERLAP)
-    vector_store = VectorStore(config.FAISS_PERSIST_DIR, config.COLLECTION_NAME)
+    vector_store = VectorStore(
+        config.FAISS_PERSIST_DIR,
+        config.COLLECTION_NAME,
+        get_embedder(),
+        config.SEARCH_CACHE_SIZE
+    )
     
     return config, doc_processor, vector_store
 
+@st.cache_resource
+def get_gemini(api_key: str, model: str):
+    """Reuse one Gemini client per API key and model across reruns"""
+    return GeminiClient(api_key, model)
+
+@st.cache_data(ttl=60)
+def check_gemini_connection(api_key: str, model: str) -> bool:
+    """Test the API key at most once a minute instead of on every rerun"""
+    return get_gemini(api_key, model).test_connection()
+
+def process_manuscript(doc_processor, uploaded_file):
+    """Extract and chunk one uploaded file; safe to run on a worker thread"""
+    # Extract text straight from the uploaded bytes
+    file_type = uploaded_file.name.split('.')[-1].lower()
+    text = doc_processor.extract_text(uploaded_file.getvalue(), file_type)
+    
+    # Chunk text
+    return doc_processor.chunk_text(text, uploaded_file.name)
+
 def main():
     st.title("🧙🏿‍♂️ Sage AI Assistant")
     st.markdown("Present your manuscripts and seek wisdom from their pages!")
@@ -37,8 +68,7 @@ def main():
         api_key = st.text_input("Gemini API Key", type="password", value=config.GEMINI_API_KEY)
         
         if api_key:
-            gemini_client = GeminiClient(api_key, config.GEMINI_MODEL)
-            if gemini_client.test_connection():
+            if check_gemini_connection(api_key, config.GEMINI_MODEL):
                 st.success("🔮 The Gemini API is attuned.")
             else:
                 st.error("❌ The spirits do not recognize this key.")
@@ -78,7 +108,12 @@ def main():
             help=f"Maximum manuscript size: {config.MAX_FILE_SIZE_MB}MB"
         )
         
+        # Show the outcome of the upload batch that triggered the last rerun
+        for message in st.session_state.pop("upload_notices", []):
+            st.success(message)
+        
         if uploaded_files:
+            files_to_process = []
             for uploaded_file in uploaded_files:
                 if uploaded_file.size > config.MAX_FILE_SIZE_MB * 1024 * 1024:
                     st.error(f"Manuscript {uploaded_file.name} is too voluminous for the tome!")
@@ -93,32 +128,43 @@ def main():
                     else:
                         continue
                 
-                # Process file
-                with st.spinner(f"Contemplating {uploaded_file.name}..."):
+                files_to_process.append(uploaded_file)
+            
+            # Extract and chunk in parallel; embedding happens once for the whole batch
+            pending_files = []
+            needs_rerun = False
+            if files_to_process:
+                with st.spinner(f"Contemplating {len(files_to_process)} manuscript(s)..."):
+                    with ThreadPoolExecutor(max_workers=config.UPLOAD_WORKERS) as executor:
+                        futures = [
+                            (uploaded_file, executor.submit(process_manuscript, doc_processor, uploaded_file))
+                            for uploaded_file in files_to_process
+                        ]
+                        for uploaded_file, future in futures:
+                            try:
+                                pending_files.append((uploaded_file.name, future.result()))
+                            except Exception as e:
+                                st.error(f"Alas, an error befell {uploaded_file.name}: {str(e)}")
+            
+            if pending_files:
+                with st.spinner("Inscribing manuscripts into the tome..."):
                     try:
-                        # Save to temp file
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                            tmp_file.write(uploaded_file.getvalue())
-                            tmp_path = tmp_file.name
-                        
-                        # Extract text
-                        file_type = uploaded_file.name.split('.')[-1].lower()
-                        text = doc_processor.extract_text(tmp_path, file_type)
-                        
-                        # Chunk text
-                        chunks = doc_processor.chunk_text(text, uploaded_file.name)
-                        
                         # Add to vector store
-                        vector_store.add_documents(chunks)
-                        
-                        # Clean up
-                        os.unlink(tmp_path)
+                        vector_store.add_documents_bulk([chunk for _, chunks in pending_files for chunk in chunks])
                         
-                        st.success(f"✅ {uploaded_file.name} has been inscribed into the tome! ({len(chunks)} passages)")
-                        st.rerun()  # Immediately refresh to update sidebar
+                        # Carry the successes across a single rerun for the whole batch; failed
+                        # files are processed again on the rerun and report their own errors
+                        st.session_state["upload_notices"] = [
+                            f"✅ {filename} has been inscribed into the tome! ({len(chunks)} passages)"
+                            for filename, chunks in pending_files
+                        ]
+                        needs_rerun = True
                         
                     except Exception as e:
-                        st.error(f"Alas, an error befell {uploaded_file.name}: {str(e)}")
+                        st.error(f"Alas, an error befell the inscription: {str(e)}")
+            
+            if needs_rerun:
+                st.rerun()  # Refresh once to update sidebar
     
     with tab2:
         st.header("Seek Wisdom")
@@ -150,7 +196,7 @@ def main():
                         return
                     
                     # Generate answer
-                    gemini_client = GeminiClient(api_key, config.GEMINI_MODEL)
+                    gemini_client = get_gemini(api_key, config.GEMINI_MODEL)
                     answer = gemini_client.generate_answer(user_query, relevant_docs)
                     
                     # Display results
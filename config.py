@@ -14,9 +14,11 @@ class Config:
     # Chunking
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
+    UPLOAD_WORKERS: int = 4
     
     # Retrieval
     TOP_K_RESULTS: int = 5
+    SEARCH_CACHE_SIZE: int = 128
     
     # UI
     MAX_FILE_SIZE_MB: int = 10
\ No newline at end of file
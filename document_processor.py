@@ -1,8 +1,9 @@
 import PyPDF2
 import docx
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from typing import List, Tuple
+from typing import List, Tuple, Union
 import hashlib
+import io
 
 class DocumentProcessor:
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
@@ -12,31 +13,30 @@ class DocumentProcessor:
             separators=["\n\n", "\n", ". ", " ", ""]
         )
     
-    def extract_text(self, file_path: str, file_type: str) -> str:
-        """Extract text from different file types"""
+    def extract_text(self, source: Union[str, bytes], file_type: str) -> str:
+        """Extract text from different file types, given a file path or the file's bytes"""
         if file_type == "pdf":
-            return self._extract_pdf(file_path)
+            return self._extract_pdf(source)
         elif file_type == "docx":
-            return self._extract_docx(file_path)
+            return self._extract_docx(source)
         elif file_type == "txt":
-            return self._extract_txt(file_path)
+            return self._extract_txt(source)
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
     
-    def _extract_pdf(self, file_path: str) -> str:
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+    def _extract_pdf(self, source: Union[str, bytes]) -> str:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+        # Join once instead of growing a string page by page
+        return "\n".join(page.extract_text() for page in pdf_reader.pages)
     
-    def _extract_docx(self, file_path: str) -> str:
-        doc = docx.Document(file_path)
+    def _extract_docx(self, source: Union[str, bytes]) -> str:
+        doc = docx.Document(io.BytesIO(source) if isinstance(source, bytes) else source)
         return "\n".join([paragraph.text for paragraph in doc.paragraphs])
     
-    def _extract_txt(self, file_path: str) -> str:
-        with open(file_path, 'r', encoding='utf-8') as file:
+    def _extract_txt(self, source: Union[str, bytes]) -> str:
+        if isinstance(source, bytes):
+            return source.decode('utf-8')
+        with open(source, 'r', encoding='utf-8') as file:
             return file.read()
     
     def chunk_text(self, text: str, filename: str) -> List[Tuple[str, dict]]:
@@ -48,8 +48,7 @@ class DocumentProcessor:
         for i, chunk in enumerate(chunks):
             metadata = {
                 "filename": filename,
-                "chunk_id": i,
-                "chunk_hash": hashlib.md5(chunk.encode()).hexdigest()
+                "chunk_id": i
             }
             chunk_data.append((chunk, metadata))
         
@@ -1,6 +1,24 @@
 import google.generativeai as genai
 from typing import List, Dict
 
+# Kept flush-left: indentation inside the prompt is billed as input tokens
+_PROMPT_TEMPLATE = """You are Sage AI, a helpful AI assistant. Answer the user's question based on the provided context documents.
+
+Context Documents:
+{context}
+
+Question: {query}
+
+Instructions:
+1. Answer the question based on the provided context
+2. If the context doesn't contain enough information, say so
+3. Cite the source documents when relevant
+4. Be concise but thorough
+5. If the user asks for a summary, provide a brief overview of the main points
+6. If the question is not a question, respond appropriately
+
+Answer:"""
+
 class GeminiClient:
     def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash"):
         genai.configure(api_key=api_key)
@@ -16,23 +34,7 @@ class GeminiClient:
         ])
         
         # Create prompt
-        prompt = f"""You are Sage AI, a helpful AI assistant. Answer the user's question based on the provided context documents.
-
-            Context Documents:
-            {context}
-
-            Question: {query}
-
-            Instructions:
-            1. Answer the question based on the provided context
-            2. If the context doesn't contain enough information, say so
-            3. Cite the source documents when relevant
-            4. Be concise but thorough
-            5. If the user asks for a summary, provide a brief overview of the main points
-            6. If the question is not a question, respond appropriately
-
-            Answer:    
-        """
+        prompt = _PROMPT_TEMPLATE.format(context=context, query=query)
         
         try:
             response = self.model.generate_content(prompt)
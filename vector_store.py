@@ -1,155 +1,535 @@
 import faiss
 import numpy as np
 import pickle
+import json
 import os
+import atexit
+import logging
+import queue
+import threading
 from sentence_transformers import SentenceTransformer
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Set
 import uuid
+from collections import OrderedDict, defaultdict
+
+logger = logging.getLogger(__name__)
 
 class VectorStore:
-    def __init__(self, persist_dir: str, collection_name: str):
+    # HNSW graph parameters: neighbours per node, build-time and query-time beam width
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+    # Smallest per-dimension range the 8-bit quantizer is trained to cover
+    SQ_MIN_RANGE = 0.25
+    # Below this many chunks a flat index searched with one matrix-vector product beats HNSW
+    EXACT_SEARCH_THRESHOLD = 10000
+    
+    def __init__(self, persist_dir: str, collection_name: str, embedding_model: SentenceTransformer,
+                 search_cache_size: int = 128):
         self.persist_dir = persist_dir
         self.collection_name = collection_name
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.embedding_dim = 384  # all-MiniLM-L6-v2 embedding dimension
+        self.embedding_model = embedding_model
+        self.embedding_dim = embedding_model.get_sentence_embedding_dimension()
+        
+        # LRU cache of search results keyed on (query, top_k)
+        self.search_cache_size = search_cache_size
+        self._search_cache = OrderedDict()
         
         # Create persist directory
         os.makedirs(persist_dir, exist_ok=True)
         
         # File paths
         self.index_path = os.path.join(persist_dir, f"{collection_name}.index")
+        self.records_path = os.path.join(persist_dir, f"{collection_name}_metadata.jsonl")
+        self.state_path = os.path.join(persist_dir, f"{collection_name}_state.json")
+        
+        # Pickles written by earlier versions, migrated to the JSONL records on load
         self.metadata_path = os.path.join(persist_dir, f"{collection_name}_metadata.pkl")
         self.documents_path = os.path.join(persist_dir, f"{collection_name}_documents.pkl")
         
-        # Initialize or load index
-        self._load_or_create_index()
+        # Index writes happen on a background thread; a single pending slot coalesces bursts
+        self._lock = threading.RLock()
+        self._save_queue = queue.Queue(maxsize=1)
+        self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+        self._save_thread.start()
+        atexit.register(self.close)
+        
+        # Initialize or load index; the writer may compact as soon as a save is queued
+        with self._lock:
+            self._load_or_create_index()
     
     def _load_or_create_index(self):
         """Load existing index or create new one"""
+        # Flat index row -> list position (-1 for tombstones), built on first exact search
+        self._row_positions = None
+        
+        # Ids of deleted chunks still in the index; hidden from search until compacted
+        self._tombstones = set()
+        self._tombstone_params = None
+        self._index_generation = 0
+        
         if os.path.exists(self.index_path):
-            # Load existing index
-            self.index = faiss.read_index(self.index_path)
-            with open(self.metadata_path, 'rb') as f:
-                self.metadata = pickle.load(f)
-            with open(self.documents_path, 'rb') as f:
-                self.documents = pickle.load(f)
+            # Memory-map the vector codes; they are only copied into memory before a write
+            self.index = faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+            self._index_mapped = True
+            deleted_ids = set()
+            if os.path.exists(self.records_path):
+                deleted_ids = self._load_records()
+            elif os.path.exists(self.metadata_path):
+                with open(self.metadata_path, 'rb') as f:
+                    self.metadata = pickle.load(f)
+                with open(self.documents_path, 'rb') as f:
+                    self.documents = pickle.load(f)
+            else:
+                # A background save landed after a reset; reconciling empties the index
+                self.metadata = []
+                self.documents = []
+            
+            # Indexes saved before chunks carried ids get wrapped in an id map
+            if not isinstance(self.index, faiss.IndexIDMap2):
+                self._migrate_to_id_map()
+            
+            # chunk_hash is no longer produced; strip it from records saved by older versions
+            stale_hashes = [meta.pop('chunk_hash') for meta in self.metadata if 'chunk_hash' in meta]
+            
+            # Compact once here, folding in deletions appended since the last load
+            dropped = self._reconcile_records(deleted_ids)
+            if stale_hashes or deleted_ids or dropped or not os.path.exists(self.records_path):
+                self._write_records()
         else:
             # Create new index
-            self.index = faiss.IndexFlatIP(self.embedding_dim)  # Inner product for cosine similarity
+            self.index = self._create_index(0)
+            self._index_mapped = False
             self.metadata = []
             self.documents = []
+            
+            # Drop records whose vectors never reached disk
+            if os.path.exists(self.records_path):
+                self._load_records()
+                if self.metadata:
+                    logger.warning(
+                        "No index at %s: dropped %d chunk records whose vectors never reached disk",
+                        self.index_path, len(self.metadata)
+                    )
+                self.metadata = []
+                self.documents = []
+                self._write_records()
+        
+        self._rebuild_id_lookup()
+        
+        # Never hand out an id that was ever issued, even if its vectors are gone from disk
+        index_ids = faiss.vector_to_array(self.index.id_map)
+        self._next_id = max(
+            self._load_next_id(),
+            int(index_ids.max(initial=-1)) + 1,
+            max(self._id_to_position, default=-1) + 1
+        )
     
-    def _save_index(self):
-        """Save index and metadata to disk"""
-        faiss.write_index(self.index, self.index_path)
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump(self.metadata, f)
-        with open(self.documents_path, 'wb') as f:
-            pickle.dump(self.documents, f)
+    def _load_next_id(self) -> int:
+        """Read the persisted id high-water mark"""
+        if not os.path.exists(self.state_path):
+            return 0
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)['next_id']
     
-    def add_documents(self, chunks: List[Tuple[str, dict]]) -> None:
-        """Add document chunks to vector store"""
-        texts = [chunk[0] for chunk in chunks]
-        metadatas = [chunk[1] for chunk in chunks]
+    def _write_next_id(self) -> None:
+        """Persist the id high-water mark before any record or vector uses the new ids"""
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"next_id": self._next_id}, f)
+        os.replace(tmp_path, self.state_path)
+    
+    def _load_records(self) -> Set[int]:
+        """Stream chunk records from the JSONL sidecar, returning the ids deleted since it was compacted"""
+        records = []
+        deleted_ids = set()
+        with open(self.records_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'deleted' in record:
+                    deleted_ids.update(record['deleted'])
+                else:
+                    records.append(record)
+        
+        live = [record for record in records if record['metadata']['faiss_id'] not in deleted_ids]
+        self.metadata = [record['metadata'] for record in live]
+        self.documents = [record['text'] for record in live]
+        return deleted_ids
+    
+    def _append_records(self, chunks: List[Tuple[str, dict]]):
+        """Append new chunk records without rewriting existing ones"""
+        with open(self.records_path, 'a', encoding='utf-8') as f:
+            f.writelines(
+                json.dumps({"text": text, "metadata": metadata}, ensure_ascii=False) + "\n"
+                for text, metadata in chunks
+            )
+    
+    def _append_deletions(self, ids: List[int]):
+        """Record deleted ids in the JSONL sidecar; the records are compacted away on the next load"""
+        with open(self.records_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"deleted": ids}) + "\n")
+    
+    def _write_records(self):
+        """Compact the JSONL sidecar down to the current records"""
+        tmp_path = f"{self.records_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(
+                json.dumps({"text": text, "metadata": metadata}, ensure_ascii=False) + "\n"
+                for text, metadata in zip(self.documents, self.metadata)
+            )
+        os.replace(tmp_path, self.records_path)
+    
+    def _reconcile_records(self, deleted_ids: Set[int]) -> bool:
+        """Repair records and index that were interrupted between writes; True if records were dropped"""
+        index_ids = faiss.vector_to_array(self.index.id_map)
+        record_ids = np.array([meta['faiss_id'] for meta in self.metadata], dtype='int64')
+        if np.array_equal(np.sort(index_ids), np.sort(record_ids)):
+            return False
+        
+        keep = np.isin(record_ids, index_ids)
+        self.metadata = [meta for meta, kept in zip(self.metadata, keep) if kept]
+        self.documents = [text for text, kept in zip(self.documents, keep) if kept]
         
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(texts)
+        orphan_ids = index_ids[~np.isin(index_ids, record_ids)]
+        dropped = int((~keep).sum())
         
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
+        # Vectors of deleted chunks are expected until the compacted index is saved
+        unexplained = len(orphan_ids) - sum(int(faiss_id) in deleted_ids for faiss_id in orphan_ids)
+        if dropped or unexplained:
+            logger.warning(
+                "Reconciling %s: dropped %d chunk records whose vectors never reached disk, "
+                "hid %d orphaned vectors without records",
+                self.records_path, dropped, unexplained
+            )
+        if len(orphan_ids):
+            self._add_tombstones(orphan_ids)
+            self._save_index()
+        return dropped > 0
+    
+    def _ensure_writable(self):
+        """Swap a memory-mapped, read-only index for a mutable in-memory copy"""
+        if self._index_mapped:
+            # clone_index would keep viewing the mapped codes, so round-trip through bytes
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self._index_mapped = False
+    
+    def _create_index(self, size: int):
+        """Create an empty index sized for `size` vectors, addressed by stable int64 ids"""
+        if size < self.EXACT_SEARCH_THRESHOLD:
+            # Small collections keep exact float32 vectors, searched with a single BLAS call
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
         
-        # Add to index
-        self.index.add(embeddings.astype('float32'))
+        # Large collections get an HNSW graph over 8-bit quantized vectors
+        hnsw_index = faiss.IndexHNSWSQ(
+            self.embedding_dim,
+            faiss.ScalarQuantizer.QT_8bit,
+            self.HNSW_M,
+            faiss.METRIC_INNER_PRODUCT  # Inner product for cosine similarity
+        )
+        hnsw_index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+        hnsw_index.hnsw.efSearch = self.HNSW_EF_SEARCH
+        return faiss.IndexIDMap2(hnsw_index)
+    
+    def _is_hnsw(self, index) -> bool:
+        return isinstance(faiss.downcast_index(index.index), faiss.IndexHNSW)
+    
+    def _train_index(self, index, vectors: np.ndarray) -> None:
+        """Train the quantizer range on the first vectors added to an empty index"""
+        if index.is_trained or len(vectors) == 0:
+            return
         
-        # Store metadata and documents
-        for i, (text, metadata) in enumerate(chunks):
-            metadata['id'] = str(uuid.uuid4())
-            self.metadata.append(metadata)
-            self.documents.append(text)
+        # Anchor the range so a small first batch cannot collapse it
+        anchors = np.full((2, self.embedding_dim), self.SQ_MIN_RANGE, dtype='float32')
+        anchors[0] *= -1
+        index.train(np.vstack([vectors, anchors]))
+    
+    def _migrate_to_id_map(self):
+        """Assign ids to a legacy positional index without re-embedding"""
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        ids = np.arange(len(vectors), dtype='int64')
         
-        # Save to disk
+        self.index = self._create_index(len(vectors))
+        self._index_mapped = False
+        if len(vectors):
+            self._train_index(self.index, vectors)
+            self.index.add_with_ids(vectors, ids)
+        for faiss_id, metadata in zip(ids, self.metadata):
+            metadata['faiss_id'] = int(faiss_id)
         self._save_index()
     
+    def _add_tombstones(self, ids: np.ndarray) -> None:
+        """Hide deleted ids from search; the background writer drops them from the graph"""
+        self._tombstones.update(int(faiss_id) for faiss_id in ids)
+        self._tombstone_params = None
+    
+    def _search_params(self):
+        """HNSW search parameters that skip tombstoned ids, or None when there are none"""
+        if not self._tombstones:
+            return None
+        
+        if self._tombstone_params is None:
+            dead = np.fromiter(self._tombstones, dtype='int64', count=len(self._tombstones))
+            batch = faiss.IDSelectorBatch(len(dead), faiss.swig_ptr(dead))
+            selector = faiss.IDSelectorNot(batch)
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.HNSW_EF_SEARCH)
+            # The selectors are referenced by pointer, so keep them alive alongside the params
+            self._tombstone_params = (params, selector, batch)
+        return self._tombstone_params[0]
+    
+    def _compact(self) -> None:
+        """Rebuild the index without tombstoned vectors, or as HNSW once it outgrows exact search"""
+        with self._lock:
+            outgrown = len(self.metadata) >= self.EXACT_SEARCH_THRESHOLD and not self._is_hnsw(self.index)
+            if not self._tombstones and not outgrown:
+                return
+            generation = self._index_generation
+            dead = np.fromiter(self._tombstones, dtype='int64', count=len(self._tombstones))
+            ids = faiss.vector_to_array(self.index.id_map)
+            vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        
+        # HNSW graphs cannot drop nodes, so build a fresh index from the stored vectors
+        keep = ~np.isin(ids, dead)
+        compacted = self._create_index(int(keep.sum()))
+        if keep.any():
+            self._train_index(compacted, vectors[keep])
+            compacted.add_with_ids(vectors[keep], ids[keep])
+        
+        with self._lock:
+            if generation != self._index_generation:
+                return  # Vectors were added meanwhile; the save they scheduled retries
+            self.index = compacted
+            self._index_mapped = False
+            self._tombstones.difference_update(int(faiss_id) for faiss_id in dead)
+            self._tombstone_params = None
+            self._row_positions = None
+    
+    def _rebuild_id_lookup(self):
+        """Map faiss ids and filenames back to positions in the metadata/documents lists"""
+        self._id_to_position = {meta['faiss_id']: i for i, meta in enumerate(self.metadata)}
+        self._row_positions = None
+        
+        self._files_index = defaultdict(list)
+        for i, meta in enumerate(self.metadata):
+            if meta.get('filename'):
+                self._files_index[meta['filename']].append(i)
+        
+        # Positions and contents changed, so cached results are stale
+        self._search_cache.clear()
+    
+    def _save_index(self):
+        """Schedule an index save; chunk records are persisted as they change"""
+        try:
+            self._save_queue.put_nowait(True)
+        except queue.Full:
+            pass  # A pending save will already write the latest index
+    
+    def _write_index(self):
+        """Write the index to disk"""
+        with self._lock:
+            data = faiss.serialize_index(self.index)
+        
+        # Disk I/O happens outside the lock so searches are not blocked behind it.
+        # Write beside and swap in, so readers of the old file are never truncated
+        tmp_path = f"{self.index_path}.tmp"
+        data.tofile(tmp_path)
+        os.replace(tmp_path, self.index_path)
+    
+    def _save_worker(self):
+        """Drain save requests until close() sends the stop sentinel"""
+        while True:
+            request = self._save_queue.get()
+            try:
+                if request is None:
+                    return
+                self._compact()
+                self._write_index()
+            except Exception:
+                logger.exception("Failed to save FAISS index to %s", self.index_path)
+            finally:
+                self._save_queue.task_done()
+    
+    def flush(self) -> None:
+        """Block until every scheduled index save has been written"""
+        self._save_queue.join()
+    
+    def close(self) -> None:
+        """Write any pending save and stop the background writer"""
+        if self._save_thread.is_alive():
+            self._save_queue.put(None)
+            self._save_thread.join()
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as unit-length float32 rows ready for FAISS without further copies"""
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=128,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True  # Normalize for cosine similarity
+        )
+        # No-op for MiniLM, which already returns contiguous float32
+        return np.ascontiguousarray(embeddings, dtype='float32')
+    
+    def add_documents(self, chunks: List[Tuple[str, dict]]) -> None:
+        """Add document chunks to vector store"""
+        self.add_documents_bulk(chunks)
+    
+    def add_documents_bulk(self, all_chunks: List[Tuple[str, dict]]) -> None:
+        """Add chunks from any number of files with a single embedding pass and save"""
+        if not all_chunks:
+            return
+        
+        texts = [chunk[0] for chunk in all_chunks]
+        
+        # Generate embeddings in one batched call
+        embeddings = self._encode(texts)
+        
+        with self._lock:
+            # Add to index under monotonically increasing ids
+            self._ensure_writable()
+            self._train_index(self.index, embeddings)
+            ids = np.arange(self._next_id, self._next_id + len(texts), dtype='int64')
+            self._next_id += len(texts)
+            self._write_next_id()
+            self.index.add_with_ids(embeddings, ids)
+            self._index_generation += 1
+            self._row_positions = None
+            
+            # One urandom read for every chunk's uuid instead of a syscall per chunk
+            random_bytes = os.urandom(16 * len(all_chunks))
+            start = len(self.metadata)
+            for i, (faiss_id, (_, metadata)) in enumerate(zip(ids, all_chunks)):
+                metadata['id'] = str(uuid.UUID(bytes=random_bytes[16 * i:16 * (i + 1)], version=4))
+                metadata['faiss_id'] = int(faiss_id)
+                self._id_to_position[metadata['faiss_id']] = start + i
+                if metadata.get('filename'):
+                    self._files_index[metadata['filename']].append(start + i)
+            
+            # Store metadata and documents
+            self.metadata.extend(metadata for _, metadata in all_chunks)
+            self.documents.extend(texts)
+            self._search_cache.clear()
+            
+            # Save to disk
+            self._append_records(all_chunks)
+            self._save_index()
+    
     def search(self, query: str, top_k: int = 5) -> List[Dict]:
         """Search for similar documents"""
-        if self.index.ntotal == 0:
-            return []
+        key = (query, top_k)
+        with self._lock:
+            results = self._search_cache.get(key)
+            if results is not None:
+                self._search_cache.move_to_end(key)
         
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query])
-        faiss.normalize_L2(query_embedding)
+        if results is None:
+            # Embed outside the lock so other sessions are not held up by the model
+            query_embedding = self._encode([query])
+            with self._lock:
+                # Search and cache together, so a concurrent add or delete cannot slip a stale entry in
+                results = self._search_embedding(query_embedding, top_k)
+                self._search_cache[key] = results
+                if len(self._search_cache) > self.search_cache_size:
+                    self._search_cache.popitem(last=False)
         
-        # Search
-        scores, indices = self.index.search(query_embedding.astype('float32'), min(top_k, self.index.ntotal))
+        # Hand out copies so callers cannot mutate cached results
+        return [dict(result) for result in results]
+    
+    def _flat_rows(self, index):
+        """Zero-copy view of a flat index's vectors, with the list position of each row"""
+        flat_index = faiss.downcast_index(index.index)
+        matrix = faiss.rev_swig_ptr(flat_index.get_xb(), flat_index.ntotal * self.embedding_dim)
+        
+        if self._row_positions is None:
+            self._row_positions = np.array(
+                [self._id_to_position.get(int(faiss_id), -1) for faiss_id in faiss.vector_to_array(index.id_map)],
+                dtype='int64'
+            )
+        return matrix.reshape(flat_index.ntotal, self.embedding_dim), self._row_positions
+    
+    def _search_embedding(self, query_embedding: np.ndarray, top_k: int) -> Tuple[Dict, ...]:
+        """Search the index with an embedded query; call with the lock held"""
+        if not self.metadata:
+            return ()
+        
+        k = min(top_k, len(self.metadata))
+        
+        index = self.index
+        if not self._is_hnsw(index):
+            # Exact cosine scores in one BLAS call, then partial sort for the top k
+            matrix, row_positions = self._flat_rows(index)
+            all_scores = matrix @ query_embedding[0]
+            all_scores[row_positions < 0] = -np.inf  # Tombstoned rows
+            rows = np.argpartition(-all_scores, k - 1)[:k]
+            rows = rows[np.argsort(-all_scores[rows])]
+            hits = zip(all_scores[rows], row_positions[rows])
+        else:
+            # Search
+            scores, indices = index.search(query_embedding, k, params=self._search_params())
+            hits = (
+                (score, self._id_to_position[int(faiss_id)])
+                for score, faiss_id in zip(scores[0], indices[0])
+                if faiss_id != -1  # -1 indicates no result
+            )
         
         # Format results
         results = []
-        for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-            if idx != -1:  # -1 indicates no result
-                results.append({
-                    "text": self.documents[idx],
-                    "metadata": self.metadata[idx],
-                    "distance": 1 - score  # Convert similarity to distance
-                })
+        for score, idx in hits:
+            results.append({
+                "text": self.documents[idx],
+                "metadata": self.metadata[idx],
+                "distance": 1 - float(score)  # Convert similarity to distance
+            })
         
-        return results
+        return tuple(results)
     
     def file_exists(self, filename: str) -> bool:
         """Check if a file already exists in the collection"""
-        return any(meta.get('filename') == filename for meta in self.metadata)
+        return filename in self._files_index
     
     def delete_file(self, filename: str) -> None:
         """Delete all chunks from a specific file"""
-        # Find indices to delete
-        indices_to_delete = [i for i, meta in enumerate(self.metadata) if meta.get('filename') == filename]
-        
-        if not indices_to_delete:
-            return
-        
-        # Create new index without deleted items
-        remaining_indices = [i for i in range(len(self.metadata)) if i not in indices_to_delete]
-        
-        if remaining_indices:
-            # Get embeddings for remaining documents
-            remaining_texts = [self.documents[i] for i in remaining_indices]
-            embeddings = self.embedding_model.encode(remaining_texts)
-            faiss.normalize_L2(embeddings)
+        with self._lock:
+            positions = self._files_index.pop(filename, None)
+            if not positions:
+                return
             
-            # Create new index
-            new_index = faiss.IndexFlatIP(self.embedding_dim)
-            new_index.add(embeddings.astype('float32'))
+            # Tombstone the ids; rebuilding the graph happens on the background writer
+            dead_ids = [self.metadata[i]['faiss_id'] for i in positions]
+            self._add_tombstones(np.array(dead_ids, dtype='int64'))
             
-            # Update data structures
-            self.index = new_index
-            self.metadata = [self.metadata[i] for i in remaining_indices]
-            self.documents = [self.documents[i] for i in remaining_indices]
-        else:
-            # No documents left
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
-            self.metadata = []
-            self.documents = []
-        
-        # Save changes
-        self._save_index()
+            # Update data structures; later positions shift, so the lookups are rebuilt
+            deleted = set(positions)
+            keep = [i for i in range(len(self.metadata)) if i not in deleted]
+            self.metadata = [self.metadata[i] for i in keep]
+            self.documents = [self.documents[i] for i in keep]
+            self._rebuild_id_lookup()
+            
+            # Save changes; the sidecar only grows by one line, it is compacted on load
+            self._append_deletions(dead_ids)
+            self._save_index()
     
     def reset_database(self) -> None:
         """Clear all data from the collection"""
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
-        self.metadata = []
-        self.documents = []
-        
-        # Remove files
-        for path in [self.index_path, self.metadata_path, self.documents_path]:
-            if os.path.exists(path):
-                os.remove(path)
+        with self._lock:
+            self.index = self._create_index(0)
+            self._index_mapped = False
+            self._index_generation += 1
+            self._tombstones = set()
+            self._tombstone_params = None
+            self.metadata = []
+            self.documents = []
+            self._rebuild_id_lookup()
+            
+            # Remove files; the id high-water mark stays so ids are never reused
+            for path in [self.index_path, self.records_path, self.metadata_path, self.documents_path]:
+                if os.path.exists(path):
+                    os.remove(path)
     
     def get_stats(self) -> Dict:
         """Get database statistics"""
-        unique_files = set(meta.get('filename', '') for meta in self.metadata)
-        unique_files.discard('')  # Remove empty filenames
-        
         return {
             "total_chunks": len(self.documents),
-            "unique_files": len(unique_files),
-            "files": list(unique_files)
+            "unique_files": len(self._files_index),
+            "files": list(self._files_index.keys())
         }
\ No newline at end of file